@@ -8,16 +8,18 @@ import numpy as np
 
 from .neighbour_search import KDTree, NNSearch
 from ..base import Descriptor
-from ..utils.np_utils import div_or, shifted_reciprocal
-from ..utils.owa_operators import OWAOperator, trimmed
+from ..utils.np_utils import div_or, shifted_reciprocal, truncated_complement
+from ..utils.owa_operators import OWAOperator, strict, trimmed
 
 
 class NNDescriptor(Descriptor):
 
     @abstractmethod
-    def __init__(self, nn_search: NNSearch, k: Union[int, Callable[[int], int]], *args, **kwargs):
+    def __init__(self, nn_search: NNSearch, k: Union[int, Callable[[int], int]], *args, block_size: int = 4096,
+                 **kwargs):
         self.nn_search = nn_search
         self.k = k
+        self.block_size = block_size
 
     @abstractmethod
     def construct(self, X) -> Model:
@@ -25,16 +27,22 @@ class NNDescriptor(Descriptor):
         nn_model = self.nn_search.construct(X)
         model.nn_model = nn_model
         model.k = self.k(len(nn_model)) if callable(self.k) else self.k
+        model.block_size = self.block_size
         return model
 
     class Model(Descriptor.Model):
 
         nn_model: NNSearch.Model
         k: int
+        block_size: int
 
         def query(self, X):
-            q_neighbours, q_distances = self.nn_model.query(X, self.k)
-            return self._query(q_neighbours, q_distances)
+            if len(X) <= self.block_size:
+                return self._query(*self.nn_model.query(X, self.k))
+            return np.concatenate([
+                self._query(*self.nn_model.query(X[i:i + self.block_size], self.k))
+                for i in range(0, len(X), self.block_size)
+            ])
 
         @abstractmethod
         def _query(self, q_neighbours, q_distances):
@@ -64,6 +72,10 @@ class NND(NNDescriptor):
         How to aggregate the proximity values from the `k` nearest neighbours.
         The default is to only consider the kth nearest neighbour distance.
 
+    block_size : int = 4096
+        Number of query instances processed at a time.
+        Larger query sets are split into blocks, to keep the intermediate arrays small.
+
     References
     ----------
 
@@ -87,8 +99,9 @@ class NND(NNDescriptor):
             k: Union[int, Callable[[int], int]] = 1,
             proximity: Callable[[float], float] = shifted_reciprocal,
             owa: OWAOperator = trimmed(),
+            block_size: int = 4096,
     ):
-        super().__init__(nn_search=nn_search, k=k)
+        super().__init__(nn_search=nn_search, k=k, block_size=block_size)
         self.proximity = proximity
         self.owa = owa
 
@@ -96,14 +109,46 @@ class NND(NNDescriptor):
         model: NND.Model = super().construct(X)
         model.proximity = self.proximity
         model.owa = self.owa
+        # choose the query path once: proximities known to be order-reversing preserve the order of the neighbour
+        # distances, so the owa weights can be applied without sorting, or skipped entirely for strict and trimmed
+        order_reversing = self.proximity in (shifted_reciprocal, truncated_complement)
+        owa_type = type(self.owa)
+        plain_owa = (isinstance(self.owa, OWAOperator) and owa_type._apply is OWAOperator._apply
+                     and owa_type.soft_max is OWAOperator.soft_max)
+        if order_reversing and owa_type in (strict, trimmed):
+            model._column = 0 if owa_type is strict else -1
+            model._query_path = 'single'
+        elif order_reversing and plain_owa:
+            model._query_path = 'ordered'
+        else:
+            model._query_path = 'generic'
         return model
 
     class Model(NNDescriptor.Model):
 
         proximity: Callable[[float], float]
         owa: OWAOperator
+        _column: int
+        _query_path: str
 
         def _query(self, q_neighbours, q_distances):
+            if self._query_path == 'single':
+                return self._query_single(q_distances)
+            if self._query_path == 'ordered':
+                return self._query_ordered(q_distances)
+            return self._query_generic(q_distances)
+
+        def _query_single(self, q_distances):
+            # strict and trimmed only need the proximity of a single neighbour
+            return self.proximity(q_distances[:, self._column])
+
+        def _query_ordered(self, q_distances):
+            # neighbours are ordered by increasing distance, so the proximities are already in decreasing order
+            # and can be aggregated directly with the owa weights, without sorting them again
+            proximities = self.proximity(q_distances)
+            return proximities @ self.owa.weights(self.k, np.result_type(proximities.dtype, np.float32))
+
+        def _query_generic(self, q_distances):
             proximities = self.proximity(q_distances)
             score = self.owa.soft_max(proximities, self.k)
             return score
@@ -120,6 +165,10 @@ class LNND(NNDescriptor):
         Should be either a positive integer not larger than the target class size,
         or a function that takes the size of the target class and returns such an integer.
 
+    block_size : int = 4096
+        Number of query instances processed at a time.
+        Larger query sets are split into blocks, to keep the intermediate arrays small.
+
     Notes
     -----
     The scores are derived with 1/(1 + l_distances).
@@ -140,13 +189,19 @@ class LNND(NNDescriptor):
        <https://link.springer.com/chapter/10.1007/BFb0033283>`_
     """
 
-    def __init__(self, nn_search: NNSearch = KDTree(), k: Union[int, Callable[[int], int]] = 1):
-        super().__init__(nn_search=nn_search, k=k)
+    def __init__(
+            self,
+            nn_search: NNSearch = KDTree(),
+            k: Union[int, Callable[[int], int]] = 1,
+            block_size: int = 4096,
+    ):
+        super().__init__(nn_search=nn_search, k=k, block_size=block_size)
 
     def construct(self, X) -> Model:
         model: LNND.Model = super().construct(X)
         _, distances = model.nn_model.query_self(model.k)
-        model.distances = distances[:, -1]
+        # store a compact copy rather than a strided view, since it is gathered from on every query
+        model.distances = np.ascontiguousarray(distances[:, -1])
         return model
 
     class Model(NNDescriptor.Model):
@@ -154,11 +209,11 @@ class LNND(NNDescriptor):
         distances: np.ndarray
 
         def _query(self, q_neighbours, q_distances):
-            # if both distances are zero, default to 1
-            l_distances = div_or(q_distances[:, self.k-1], self.distances[q_neighbours[:, self.k-1]], 1)
-            # replace infinites with very large numbers, but keep nans (which shouldn't be here) to flag problems
-            l_distances = np.nan_to_num(l_distances, nan=np.nan)
-            return shifted_reciprocal(l_distances)
+            q_distances = q_distances[:, self.k-1]
+            distances = self.distances[q_neighbours[:, self.k-1]]
+            # 1/(1 + q_distances/distances) in a single division;
+            # if both distances are zero, the local distance defaults to 1, and the score to 0.5
+            return div_or(distances, q_distances + distances, 0.5)
 
 
 class LOF(NNDescriptor):
@@ -172,6 +227,10 @@ class LOF(NNDescriptor):
         Should be either a positive integer not larger than the target class size,
         or a function that takes the size of the target class and returns such an integer.
 
+    block_size : int = 4096
+        Number of query instances processed at a time.
+        Larger query sets are split into blocks, to keep the intermediate arrays small.
+
     Notes
     -----
     The scores are derived with 1/(1 + lof).
@@ -187,13 +246,19 @@ class LOF(NNDescriptor):
        <https://dl.acm.org/doi/abs/10.1145/342009.335388>`_
     """
 
-    def __init__(self, nn_search: NNSearch = KDTree(), k: Union[int, Callable[[int], int]] = 1):
-        super().__init__(nn_search=nn_search, k=k)
+    def __init__(
+            self,
+            nn_search: NNSearch = KDTree(),
+            k: Union[int, Callable[[int], int]] = 1,
+            block_size: int = 4096,
+    ):
+        super().__init__(nn_search=nn_search, k=k, block_size=block_size)
 
     def construct(self, X) -> Model:
         model: LOF.Model = super().construct(X)
         neighbours, distances = model.nn_model.query_self(model.k)
-        model.distances = distances[:, -1]
+        # store a compact copy rather than a strided view, since it is gathered from on every query
+        model.distances = np.ascontiguousarray(distances[:, -1])
         model.lrd = model._get_lrd(neighbours, distances)
         return model
 
@@ -203,12 +268,16 @@ class LOF(NNDescriptor):
         lrd: np.ndarray
 
         def _get_lrd(self, q_neighbours, q_distances):
-            r_distances = np.maximum(q_distances, self.distances[q_neighbours])
-            return 1/np.mean(r_distances, axis=-1)
+            # the gathered k-distances are a new array, so the reachability distances can be computed in place
+            r_distances = self.distances[q_neighbours]
+            np.maximum(q_distances, r_distances, out=r_distances)
+            return r_distances.shape[-1]/np.sum(r_distances, axis=-1)
 
         def _query(self, q_neighbours, q_distances):
             q_lrd = self._get_lrd(q_neighbours, q_distances)
             lof = np.mean(self.lrd[q_neighbours], axis=-1) / q_lrd
             # handle nan, which comes from inf/inf
-            lof[np.isnan(lof)] = 1
-            return shifted_reciprocal(lof)
+            np.copyto(lof, 1, where=np.isnan(lof))
+            # shifted reciprocal, in place
+            lof += 1
+            return np.reciprocal(lof, out=lof)
@@ -13,7 +13,8 @@ from frlearn.base import ModelFactory
 class NNSearch(ModelFactory):
     """
     Abstract base class for nearest neighbour searches. Subclasses must
-    implement Model._query (and typically __init__ and construct).
+    implement Model._query (and typically __init__ and construct), which
+    should return neighbours in order of increasing distance.
     """
 
     def construct(self, X) -> Model:
@@ -60,11 +61,11 @@ class NNSearch(ModelFactory):
             -------
             I : array shape=(n, k, )
                 Indices of the k nearest neighbours among the construction
-                instances for each query instance.
+                instances for each query instance, in order of increasing distance.
 
             D : array shape=(n, k, )
                 Distances to the k nearest neighbours among the construction
-                instances for each query instance.
+                instances for each query instance, in increasing order.
             """
             if callable(k):
                 k = k(self.n)
@@ -0,0 +1,146 @@
+import gc
+import weakref
+
+import pytest
+
+import numpy as np
+from sklearn.datasets import load_iris
+
+from frlearn.neighbours.descriptors import LNND, LOF, NND
+from frlearn.neighbours.neighbour_search import KDTree
+from frlearn.utils.np_utils import fractional_k, shifted_reciprocal, truncated_complement
+from frlearn.utils.owa_operators import additive, exponential, strict, trimmed
+
+
+@pytest.fixture
+def data():
+    return load_iris(return_X_y=True)
+
+
+@pytest.mark.parametrize('owa', [additive(), exponential(), strict(), trimmed()])
+@pytest.mark.parametrize('k', [1, 5, 20])
+@pytest.mark.parametrize('proximity', [shifted_reciprocal, truncated_complement])
+def test_nnd(data, owa, k, proximity):
+    X, y = data
+    X_train, X_test = X[y == 0], X[y != 0]
+
+    model = NND(k=k, owa=owa, proximity=proximity).construct(X_train)
+    reference_model = NND(k=k, owa=owa, proximity=lambda x: proximity(x)).construct(X_train)
+
+    scores = model.query(X_test)
+    assert scores.shape == (X_test.shape[0], )
+    assert np.allclose(scores, reference_model.query(X_test))
+
+
+
+@pytest.mark.parametrize('descriptor', [NND(k=3, owa=additive()), LNND(k=3), LOF(k=3)])
+def test_reassigned_k(data, descriptor):
+    X, y = data
+    descriptor.k = fractional_k(.1)
+    model = descriptor.construct(X)
+    assert model.k == 15
+    assert model.query(X).shape == (X.shape[0], )
+
+@pytest.mark.parametrize('Descriptor', [LNND, LOF])
+@pytest.mark.parametrize('k', [1, 5, 20])
+def test_local_descriptors(data, Descriptor, k):
+    X, y = data
+    X_train, X_test = X[y == 0], X[y != 0]
+
+    model = Descriptor(k=k).construct(X_train)
+
+    scores = model.query(np.concatenate([X_train, X_test]))
+    assert scores.shape == (X_train.shape[0] + X_test.shape[0], )
+    assert np.all((scores >= 0) & (scores <= 1))
+    assert np.mean(scores[:len(X_train)]) > np.mean(scores[len(X_train):])
+
+
+@pytest.mark.parametrize('Descriptor', [NND, LNND, LOF])
+def test_blocked_query(data, Descriptor):
+    X, y = data
+    scores = Descriptor(k=5).construct(X[y == 0]).query(X)
+    assert np.array_equal(Descriptor(k=5, block_size=16).construct(X[y == 0]).query(X), scores)
+
+
+class SinglePrecisionKDTree(KDTree):
+
+    class Model(KDTree.Model):
+
+        def _query(self, X, k: int):
+            q_neighbours, q_distances = super()._query(X, k)
+            return q_neighbours, q_distances.astype(np.float32)
+
+
+@pytest.mark.parametrize('Descriptor', [NND, LNND, LOF])
+@pytest.mark.parametrize('nn_search, dtype', [(KDTree(), np.float64), (SinglePrecisionKDTree(), np.float32)])
+def test_dtype(data, Descriptor, nn_search, dtype):
+    X, y = data
+    model = Descriptor(nn_search=nn_search, k=5).construct(X[y == 0])
+    assert model.query(X).dtype == dtype
+
+
+def test_nnd_owa_override(data):
+    X, y = data
+    X_train, X_test = X[y == 0], X[y != 0]
+
+    class harmonic_additive(additive):
+        def _apply(self, a, axis, flavour: str):
+            return super()._apply(a, axis=axis, flavour='harmonic')
+
+    model = NND(k=5, owa=harmonic_additive()).construct(X_train)
+    reference_model = NND(k=5, owa=harmonic_additive(), proximity=lambda x: shifted_reciprocal(x)).construct(X_train)
+    assert np.allclose(model.query(X_test), reference_model.query(X_test))
+
+
+@pytest.mark.parametrize('owa', [additive(), trimmed()])
+def test_nnd_released(data, owa):
+    X, y = data
+    model = NND(k=5, owa=owa).construct(X)
+    reference = weakref.ref(model)
+    gc.disable()
+    try:
+        del model
+        assert reference() is None
+    finally:
+        gc.enable()
+
+
+@pytest.fixture
+def duplicates():
+    X = np.array([[0.], [0.], [1.], [4.]])
+    X_query = np.array([[0.], [.25], [1.25], [4.5]])
+    return X, X_query
+
+
+def test_lnnd_values(data, duplicates):
+    X, X_query = duplicates
+    model = LNND(k=1).construct(X)
+    # both distances zero, only the distance of the neighbour zero, and two regular cases
+    assert np.allclose(model.query(X_query), [.5, 0, 1 / (1 + .25), 1 / (1 + .5 / 3)])
+
+    X, y = data
+    for k in [1, 5]:
+        model = LNND(k=k).construct(X[y != 2])
+        q_neighbours, q_distances = model.nn_model.query(X, k)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            l_distances = q_distances[:, k - 1] / model.distances[q_neighbours[:, k - 1]]
+        l_distances[np.isnan(l_distances)] = 1
+        assert np.allclose(model.query(X), 1 / (1 + l_distances))
+
+
+def test_lof_values(data, duplicates):
+    X, X_query = duplicates
+    # inf/inf lof defaults to 1, inf lof gives 0
+    with np.errstate(divide='ignore', invalid='ignore'):
+        model = LOF(k=1).construct(X)
+        assert np.allclose(model.query(X_query), [.5, 0, .5, .5])
+
+    X, y = data
+    for k in [1, 5]:
+        model = LOF(k=k).construct(X[y != 2])
+        q_neighbours, q_distances = model.nn_model.query(X, k)
+        with np.errstate(divide='ignore', invalid='ignore'):
+            q_lrd = 1 / np.mean(np.maximum(q_distances, model.distances[q_neighbours]), axis=-1)
+            lof = np.mean(model.lrd[q_neighbours], axis=-1) / q_lrd
+            lof[np.isnan(lof)] = 1
+            assert np.allclose(model.query(X), 1 / (1 + lof))
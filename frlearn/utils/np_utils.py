@@ -105,10 +105,10 @@ def least(a, k: Union[int, Callable[[int], int]], axis: int = -1):
         k = k(a.shape[axis])
     if k == a.shape[axis]:
         return np.sort(a, axis=axis)
-    a = np.partition(a, k - 1, axis=axis)
-    take_this = np.arange(k)
-    a = np.take(a, take_this, axis=axis)
-    a = np.sort(a, axis=axis)
+    slc = [slice(None)] * len(a.shape)
+    slc[axis] = slice(0, k)
+    # sort only the selected values, into a compact copy
+    a = np.sort(np.partition(a, k - 1, axis=axis)[tuple(slc)], axis=axis)
     return a
 
 
@@ -140,11 +140,11 @@ def greatest(a, k: Union[int, Callable[[int], int]], axis: int = -1):
         k = k(a.shape[axis])
     if k == a.shape[axis]:
         return np.flip(np.sort(a, axis=axis), axis=axis)
-    a = np.partition(a, -k, axis=axis)
-    take_this = np.arange(-k % a.shape[axis], a.shape[axis])
-    a = np.take(a, take_this, axis=axis)
-    a = np.flip(np.sort(a, axis=axis), axis=axis)
-    return a
+    slc = [slice(None)] * len(a.shape)
+    slc[axis] = slice(-k, None)
+    # sort only the selected values, into a compact copy
+    a = np.sort(np.partition(a, -k, axis=axis)[tuple(slc)], axis=axis)
+    return np.flip(a, axis=axis)
 
 
 def fractional_k(a):
@@ -230,7 +230,7 @@ def shifted_reciprocal(x, c: float = 1):
     y : float
         Output value in [0, 1].
     """
-    return 1/(1 + x/c)
+    return c/(c + x)
 
 
 def truncated_complement(x):
@@ -1,6 +1,9 @@
 """Owa operators"""
 from __future__ import annotations
 
+from collections import OrderedDict
+from functools import lru_cache
+
 import numpy as np
 
 from .np_utils import first, greatest, last, least
@@ -32,24 +35,69 @@ class OWAOperator():
         self.f = f
         self.scale = scale
         self.name = name
+        self._weights = OrderedDict()
+        # operators are compared through the weight vector of length 16, which is fixed from here on
+        self._fingerprint = np.asarray(f(16), dtype=float).tobytes()
 
     def __eq__(self, other):
         if isinstance(other, OWAOperator):
-            return np.array_equal(self.f(16), other.f(16))
+            return self._fingerprint == other._fingerprint
         return NotImplemented
 
+    def __hash__(self):
+        return hash(self._fingerprint)
+
     def __str__(self):
         return self.name or str(self.f(4))
 
+    def weights(self, k: int, dtype=np.float64):
+        """
+        Returns the weight vector of length `k`, which is generated only once and then reused.
+
+        Parameters
+        ----------
+        k : int
+            Length of the weight vector.
+
+        dtype : data-type, default=np.float64
+            Data type of the weight vector.
+
+        Returns
+        -------
+        w : array shape=(k, )
+            Read-only weight vector, in the order returned by `f(k)`. The `soft_*` methods apply it
+            to the values in the order in which they select them.
+        """
+        return self._get_weights(k, dtype)
+
+    def _get_weights(self, k: int, dtype, reverse: bool = False):
+        # weight vectors are fixed for a given length, so keep the most recently used ones
+        key = (k, np.dtype(dtype), reverse)
+        w = self._weights.get(key)
+        if w is not None:
+            self._weights.move_to_end(key)
+            return w
+        w = self.f(k)
+        w = np.ascontiguousarray(np.flip(w) if reverse else w, dtype=dtype)
+        w.setflags(write=False)
+        self._weights[key] = w
+        if len(self._weights) > 256:
+            self._weights.popitem(last=False)
+        return w
+
     def _apply(self, a, axis, flavour: str):
-        w = self.f(a.shape[axis])
-        w = np.reshape(w, [-1] + ((len(a.shape) - axis - 1) % len(a.shape)) * [1])
+        return self._weighted_sum(a, axis=axis, flavour=flavour)
+
+    def _weighted_sum(self, a, axis, flavour: str, reverse: bool = False):
+        # keep single precision input in single precision
+        w = self._get_weights(a.shape[axis], np.result_type(a.dtype, np.float32), reverse=reverse)
+        a = np.moveaxis(a, axis, -1)
         if flavour == 'arithmetic':
-            return np.sum(w * a, axis=axis)
+            return a @ w
         if flavour == 'geometric':
-            return np.exp(np.sum(w * np.log(a), axis=axis))
+            return np.exp(np.log(a) @ w)
         if flavour == 'harmonic':
-            return 1 / np.sum(w / a, axis=axis)
+            return 1 / ((1 / a) @ w)
 
     def soft_max(self, a, k, axis=-1, flavour: str = 'arithmetic'):
         """
@@ -75,9 +123,12 @@ class OWAOperator():
         -------
         soft_max_along_axis : ndarray
             An array with the same shape as `a`, with the specified
-            axis removed. If `a` is a 0-d array, a scalar is returned.
+            axis removed. If `a` is 1-d, a scalar is returned.
         """
         a = greatest(a, k, axis=axis)
+        if type(self)._apply is OWAOperator._apply:
+            # apply reversed weights rather than flipping the values, which are sorted in increasing order
+            return self._weighted_sum(np.flip(a, axis=axis), axis=axis, flavour=flavour, reverse=True)
         return self._apply(a, axis=axis, flavour=flavour)
 
     def soft_min(self, a, k, axis=-1, flavour: str = 'arithmetic'):
@@ -104,7 +155,7 @@ class OWAOperator():
         -------
         soft_min_along_axis : ndarray
             An array with the same shape as `a`, with the specified
-            axis removed. If `a` is a 0-d array, a scalar is returned.
+            axis removed. If `a` is 1-d, a scalar is returned.
         """
         a = least(a, k, axis=axis)
         return self._apply(a, axis=axis, flavour=flavour)
@@ -133,7 +184,7 @@ class OWAOperator():
         -------
         soft_head_along_axis : ndarray
             An array with the same shape as `a`, with the specified
-            axis removed. If `a` is a 0-d array, a scalar is returned.
+            axis removed. If `a` is 1-d, a scalar is returned.
         """
         a = first(a, k, axis=axis)
         return self._apply(a, axis=axis, flavour=flavour)
@@ -162,53 +213,108 @@ class OWAOperator():
         -------
         soft_tail_along_axis : ndarray
             An array with the same shape as `a`, with the specified
-            axis removed. If `a` is a 0-d array, a scalar is returned.
+            axis removed. If `a` is 1-d, a scalar is returned.
         """
         a = last(a, k, axis=axis)
+        if type(self)._apply is OWAOperator._apply:
+            # apply reversed weights rather than flipping the values
+            return self._weighted_sum(np.flip(a, axis=axis), axis=axis, flavour=flavour, reverse=True)
         return self._apply(a, axis=axis, flavour=flavour)
 
 
+def _read_only(w):
+    w.setflags(write=False)
+    return w
+
+
+# the weight vectors of the standard operators only depend on k, so they are generated once and shared
+
+@lru_cache(maxsize=256)
+def _strict_weights(k):
+    return _read_only(np.append(np.ones(1), np.zeros(k - 1)))
+
+
+@lru_cache(maxsize=256)
+def _additive_weights(k):
+    return _read_only(np.flip(2 * np.arange(1, k + 1) / (k * (k + 1))))
+
+
+@lru_cache(maxsize=256)
+def _exponential_weights(k):
+    return _read_only(np.flip(2 ** np.arange(k) / (2 ** k - 1)) if k < 32 else np.cumprod(np.full(k, 0.5)))
+
+
+@lru_cache(maxsize=256)
+def _invadd_weights(k):
+    return _read_only(1 / (np.arange(1, k + 1) * np.sum(1 / np.arange(1, k + 1))))
+
+
+@lru_cache(maxsize=256)
+def _mean_weights(k):
+    return _read_only(np.full(k, 1 / k))
+
+
+@lru_cache(maxsize=256)
+def _trimmed_weights(k):
+    return _read_only(np.append(np.zeros(k - 1), np.ones(1)))
+
+
 class strict(OWAOperator):
     def __init__(self):
-        f = lambda k: np.append(np.ones(1), np.zeros(k - 1))
-        super().__init__(f=f, name='strict')
+        super().__init__(f=_strict_weights, name='strict')
 
     def _apply(self, a, axis, flavour: str):
         return a.take(indices=0, axis=axis)
 
+    def soft_max(self, a, k, axis=-1, flavour: str = 'arithmetic'):
+        # only the greatest value is needed, regardless of k
+        return np.max(a, axis=axis)
+
+    def soft_min(self, a, k, axis=-1, flavour: str = 'arithmetic'):
+        # only the least value is needed, regardless of k
+        return np.min(a, axis=axis)
+
 
 class additive(OWAOperator):
     def __init__(self):
-        f = lambda k: np.flip(2 * np.arange(1, k + 1) / (k * (k + 1)))
-        super().__init__(f=f, name='additive')
+        super().__init__(f=_additive_weights, name='additive')
 
 
 class exponential(OWAOperator):
     def __init__(self):
-        f = lambda k: np.flip(2 ** np.arange(k) / (2 ** k - 1)) if k < 32 else np.cumprod(np.full(k, 0.5))
-        super().__init__(f=f, name='exponential')
+        super().__init__(f=_exponential_weights, name='exponential')
 
 
 class invadd(OWAOperator):
     def __init__(self):
-        f = lambda k: 1 / (np.arange(1, k + 1) * np.sum(1 / np.arange(1, k + 1)))
-        super().__init__(f=f, name='invadd')
+        super().__init__(f=_invadd_weights, name='invadd')
 
 
 class mean(OWAOperator):
     def __init__(self):
-        f = lambda k: np.full(k, 1 / k)
-        super().__init__(f=f, name='mean')
+        super().__init__(f=_mean_weights, name='mean')
 
 
 class trimmed(OWAOperator):
     def __init__(self):
-        f = lambda k: np.append(np.zeros(k - 1), np.ones(1))
-        super().__init__(f=f, name='trimmed')
+        super().__init__(f=_trimmed_weights, name='trimmed')
 
     def _apply(self, a, axis, flavour: str):
         return a.take(indices=-1, axis=axis)
 
+    def soft_max(self, a, k, axis=-1, flavour: str = 'arithmetic'):
+        # only the kth greatest value is needed, which a single partition provides without sorting
+        if callable(k):
+            k = k(a.shape[axis])
+        return np.partition(a, -k, axis=axis).take(indices=-k, axis=axis)
+
+    def soft_min(self, a, k, axis=-1, flavour: str = 'arithmetic'):
+        # only the kth least value is needed, which a single partition provides without sorting
+        if callable(k):
+            k = k(a.shape[axis])
+        return np.partition(a, k - 1, axis=axis).take(indices=k - 1, axis=axis)
+
+
 class deltaquadsigmoid(OWAOperator):
     def __init__(self, alpha, beta):
         def Q(a):
@@ -3,6 +3,7 @@ import pytest
 import numpy as np
 
 from frlearn.utils import first, fractional_k, greatest, last, least
+from frlearn.utils.owa_operators import OWAOperator, additive, exponential, strict, trimmed
 
 
 @pytest.fixture
@@ -32,6 +33,7 @@ def test_least(a):
     assert np.array_equal(least(a, k=2, axis=0), np.array([[1, 3, 2], [6, 5, 4]]))
     assert np.array_equal(least(a, k=fractional_k(.7), axis=1), np.array([[1, 2], [4, 5], [7, 8]]))
     assert np.array_equal(least(a, k=fractional_k(.01), axis=1), np.array([[1], [4], [7]]))
+    assert least(a, k=2, axis=-1).base is None
 
 
 def test_greatest(a):
@@ -40,3 +42,41 @@ def test_greatest(a):
     assert np.array_equal(greatest(a, k=2, axis=0), np.array([[9, 7, 8], [6, 5, 4]]))
     assert np.array_equal(greatest(a, k=fractional_k(.7), axis=1), np.array([[3, 2], [6, 5], [9, 8]]))
     assert np.array_equal(greatest(a, k=fractional_k(.01), axis=1), np.array([[3], [6], [9]]))
+    assert greatest(a, k=2, axis=-1).base.shape == (3, 2)
+
+
+def test_trimmed(a):
+    owa = trimmed()
+    assert np.array_equal(owa.soft_max(a, k=2, axis=-1), np.array([2, 5, 8]))
+    assert np.array_equal(owa.soft_max(a, k=2, axis=0), np.array([6, 5, 4]))
+    assert np.array_equal(owa.soft_min(a, k=2, axis=-1), np.array([2, 5, 8]))
+    assert np.array_equal(owa.soft_min(a, k=fractional_k(1), axis=0), np.array([9, 7, 8]))
+
+
+@pytest.mark.parametrize('owa', [additive(), exponential(), strict(), trimmed()])
+@pytest.mark.parametrize('method', ['soft_max', 'soft_min', 'soft_head', 'soft_tail'])
+def test_owa_batched(a, owa, method):
+    f = getattr(owa, method)
+    assert np.allclose(f(a, k=2, axis=-1), [f(row, k=2) for row in a])
+    assert np.allclose(f(a, k=2, axis=0), [f(column, k=2) for column in a.T])
+
+
+def test_owa_apply_override(a):
+    class total(OWAOperator):
+        def __init__(self):
+            super().__init__(f=lambda k: np.ones(k))
+
+        def _apply(self, a, axis, flavour: str):
+            return np.sum(a, axis=axis)
+
+    owa = total()
+    assert np.array_equal(owa.soft_max(a, k=2, axis=-1), np.array([5, 11, 17]))
+    assert np.array_equal(owa.soft_tail(a, k=2, axis=-1), np.array([5, 9, 15]))
+
+
+def test_owa_weights_cache():
+    owa = additive()
+    for n in range(1, 1001):
+        owa.soft_max(np.arange(n, dtype=float), k=n)
+    assert len(owa._weights) <= 256
+    assert np.allclose(owa.soft_max(np.arange(3, dtype=float), k=3), [2, 1, 0] @ owa.weights(3))